@@ -553,8 +553,8 @@ class {info["class_name"]}(BaseTool):
         """
         log_tool_execution("{info["snake_name"]}", earliest_time=earliest_time, latest_time=latest_time, max_results=max_results{custom_params_logging})
 
-        self.logger.info(f"Executing {info["name"]} search")
-        ctx.info(f"Running {info["name"]} search operation")
+        self.logger.info("Executing {info["name"]} search")
+        ctx.info("Running {info["name"]} search operation")
 
         try:
             is_available, service, error_msg = self.check_splunk_available(ctx)
@@ -595,7 +595,7 @@ class {info["class_name"]}(BaseTool):
             }})
 
         except Exception as e:
-            self.logger.error(f"Failed to execute {info["name"]} search: {{str(e)}}")
+            self.logger.error("Failed to execute {info["name"]} search: %s", e)
             ctx.error(f"Failed to execute {info["name"]} search: {{str(e)}}")
             return self.format_error_response(str(e))
 '''
@@ -715,8 +715,8 @@ class {info["class_name"]}(BaseTool):
         """
         log_tool_execution("{info["snake_name"]}"{custom_params_logging})
 
-        self.logger.info(f"Executing {info["name"]} tool")
-        ctx.info(f"Running {info["name"]} operation")
+        self.logger.info("Executing {info["name"]} tool")
+        ctx.info("Running {info["name"]} operation")
 
         try:
             # TODO: Implement tool functionality here
@@ -740,7 +740,7 @@ class {info["class_name"]}(BaseTool):
             return self.format_success_response(result)
 
         except Exception as e:
-            self.logger.error(f"Failed to execute {info["name"]}: {{str(e)}}")
+            self.logger.error("Failed to execute {info["name"]}: %s", e)
             ctx.error(f"Failed to execute {info["name"]}: {{str(e)}}")
             return self.format_error_response(str(e))
 '''
@@ -12,16 +12,37 @@ Usage:
 """
 
 import argparse
+import io
 import json
 import os
 import sys
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from pathlib import Path
+from typing import NamedTuple
 
+try:
+    import orjson
 
-@dataclass
-class Finding:
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Shared read-only default for chained .get() lookups on parsed SARIF data
+_EMPTY: dict = {}
+
+# CVSS score bands: < 4.0 low, < 7.0 medium, < 9.0 high, otherwise critical
+_SEV_THRESHOLDS = (4.0, 7.0, 9.0)
+_SEV_LABELS = ("low", "medium", "high", "critical")
+
+# Bit per --fail-on name so the policy check is a single AND
+_POLICY_BITS = {"critical": 1, "high": 2, "medium": 4, "low": 8, "secret": 16, "any": 32}
+
+
+class Finding(NamedTuple):
     """Represents a single security finding."""
 
     tool: str
@@ -35,45 +56,88 @@ class Finding:
     remediation: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ScanResult:
-    """Aggregated results from all security scans."""
+    """Aggregated results from all security scans.
+
+    Findings are only added through add_findings(), which keeps the severity
+    and category indexes in step; ``findings`` is a read-only view.
+    """
 
-    findings: list[Finding] = field(default_factory=list)
     tool_status: dict[str, str] = field(default_factory=dict)
-    scan_time: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    scan_time: str = ""
+
+    _findings: list[Finding] = field(default_factory=list, init=False, repr=False)
+    _by_severity: dict[str, list[Finding]] = field(
+        default_factory=lambda: defaultdict(list), init=False, repr=False, compare=False
+    )
+    _by_category: dict[str, list[Finding]] = field(
+        default_factory=lambda: defaultdict(list), init=False, repr=False, compare=False
+    )
+
+    def add_findings(self, findings: list[Finding]) -> None:
+        """Append findings and index them by severity and category."""
+        self._findings.extend(findings)
+        for f in findings:
+            self._by_severity[f.severity].append(f)
+            self._by_category[f.category].append(f)
+
+    @property
+    def findings(self) -> tuple[Finding, ...]:
+        return tuple(self._findings)
+
+    def of_severity(self, severity: str) -> tuple[Finding, ...]:
+        return tuple(self._by_severity.get(severity, ()))
 
     @property
     def critical_count(self) -> int:
-        return len([f for f in self.findings if f.severity == "critical"])
+        return len(self._by_severity["critical"])
 
     @property
     def high_count(self) -> int:
-        return len([f for f in self.findings if f.severity == "high"])
+        return len(self._by_severity["high"])
 
     @property
     def medium_count(self) -> int:
-        return len([f for f in self.findings if f.severity == "medium"])
+        return len(self._by_severity["medium"])
 
     @property
     def low_count(self) -> int:
-        return len([f for f in self.findings if f.severity == "low"])
+        return len(self._by_severity["low"])
 
     @property
     def secret_count(self) -> int:
-        return len([f for f in self.findings if f.category == "secret"])
+        return len(self._by_category["secret"])
 
     @property
     def total_count(self) -> int:
-        return len(self.findings)
+        return len(self._findings)
+
+
+def _classify_cvss(score) -> str:
+    """Map a CVSS score (number or numeric string) to a severity label."""
+    try:
+        return _SEV_LABELS[bisect_right(_SEV_THRESHOLDS, float(score))]
+    except (TypeError, ValueError):
+        return "medium"
+
+
+def _load_json(filepath: str):
+    """Load a JSON/SARIF artifact, using orjson when available.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only
+    need to catch the latter.
+    """
+    with open(filepath, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
 
 
 def parse_bandit_json(filepath: str) -> list[Finding]:
     """Parse Bandit JSON output."""
     findings = []
     try:
-        with open(filepath) as f:
-            data = json.load(f)
+        data = _load_json(filepath)
 
         severity_map = {"HIGH": "high", "MEDIUM": "medium", "LOW": "low"}
         for result in data.get("results", []):
@@ -95,33 +159,41 @@ def parse_bandit_json(filepath: str) -> list[Finding]:
     return findings
 
 
+def _sarif_location(result: dict) -> tuple[dict, dict]:
+    """Return the (artifactLocation, region) of a SARIF result's first location."""
+    locations = result.get("locations")
+    if not locations:
+        return _EMPTY, _EMPTY
+    physical = locations[0].get("physicalLocation") or _EMPTY
+    return physical.get("artifactLocation") or _EMPTY, physical.get("region") or _EMPTY
+
+
 def parse_semgrep_sarif(filepath: str) -> list[Finding]:
     """Parse Semgrep SARIF output."""
     findings = []
     try:
-        with open(filepath) as f:
-            data = json.load(f)
+        data = _load_json(filepath)
 
         level_map = {"error": "high", "warning": "medium", "note": "low", "none": "info"}
         for run in data.get("runs", []):
             rules = {r["id"]: r for r in run.get("tool", {}).get("driver", {}).get("rules", [])}
             for result in run.get("results", []):
                 rule_id = result.get("ruleId", "unknown")
-                rule = rules.get(rule_id, {})
+                rule = rules.get(rule_id, _EMPTY)
                 level = result.get("level", "warning")
                 severity = level_map.get(level, "medium")
                 if "security" in rule_id.lower() and severity == "medium":
                     severity = "high"
-                location = result.get("locations", [{}])[0].get("physicalLocation", {})
+                artifact, region = _sarif_location(result)
                 findings.append(Finding(
                     tool="semgrep",
                     severity=severity,
                     category="sast",
                     title=rule_id,
-                    description=result.get("message", {}).get("text", ""),
-                    file=location.get("artifactLocation", {}).get("uri", ""),
-                    line=location.get("region", {}).get("startLine", 0),
-                    remediation=rule.get("help", {}).get("text", ""),
+                    description=(result.get("message") or _EMPTY).get("text", ""),
+                    file=artifact.get("uri", ""),
+                    line=region.get("startLine", 0),
+                    remediation=(rule.get("help") or _EMPTY).get("text", ""),
                 ))
     except (FileNotFoundError, json.JSONDecodeError):
         pass  # File missing or malformed - tool may not have run
@@ -132,37 +204,25 @@ def parse_trivy_sarif(filepath: str) -> list[Finding]:
     """Parse Trivy SARIF output."""
     findings = []
     try:
-        with open(filepath) as f:
-            data = json.load(f)
+        data = _load_json(filepath)
 
         for run in data.get("runs", []):
             rules = {r["id"]: r for r in run.get("tool", {}).get("driver", {}).get("rules", [])}
             for result in run.get("results", []):
                 rule_id = result.get("ruleId", "unknown")
-                rule = rules.get(rule_id, {})
-                props = rule.get("properties", {})
-                try:
-                    score = float(props.get("security-severity", "5.0"))
-                    if score >= 9.0:
-                        severity = "critical"
-                    elif score >= 7.0:
-                        severity = "high"
-                    elif score >= 4.0:
-                        severity = "medium"
-                    else:
-                        severity = "low"
-                except ValueError:
-                    severity = "medium"
-                location = result.get("locations", [{}])[0].get("physicalLocation", {})
+                rule = rules.get(rule_id, _EMPTY)
+                props = rule.get("properties") or _EMPTY
+                severity = _classify_cvss(props.get("security-severity", "5.0"))
+                artifact, region = _sarif_location(result)
                 findings.append(Finding(
                     tool="trivy",
                     severity=severity,
                     category="dependency",
                     title=rule_id,
-                    description=result.get("message", {}).get("text", ""),
-                    file=location.get("artifactLocation", {}).get("uri", ""),
+                    description=(result.get("message") or _EMPTY).get("text", ""),
+                    file=artifact.get("uri", ""),
                     cve=rule_id if rule_id.startswith("CVE-") else "",
-                    remediation=rule.get("help", {}).get("text", ""),
+                    remediation=(rule.get("help") or _EMPTY).get("text", ""),
                 ))
     except (FileNotFoundError, json.JSONDecodeError):
         pass  # File missing or malformed - tool may not have run
@@ -173,26 +233,20 @@ def parse_safety_json(filepath: str) -> list[Finding]:
     """Parse Safety JSON output."""
     findings = []
     try:
-        with open(filepath) as f:
-            data = json.load(f)
+        data = _load_json(filepath)
 
-        vulns = data.get("vulnerabilities", [])
-        if not vulns:
-            vulns = data if isinstance(data, list) else []
+        # Newer Safety releases wrap results in {"vulnerabilities": [...]};
+        # older ones emit a bare list.
+        if isinstance(data, dict):
+            vulns = data.get("vulnerabilities") or []
+        elif isinstance(data, list):
+            vulns = data
+        else:
+            vulns = []
 
         for vuln in vulns:
-            severity = "medium"
-            cvss = vuln.get("severity", {})
-            if isinstance(cvss, dict):
-                score = cvss.get("cvss_score", 5.0)
-                if score >= 9.0:
-                    severity = "critical"
-                elif score >= 7.0:
-                    severity = "high"
-                elif score >= 4.0:
-                    severity = "medium"
-                else:
-                    severity = "low"
+            cvss = vuln.get("severity")
+            severity = _classify_cvss(cvss.get("cvss_score", 5.0)) if isinstance(cvss, dict) else "medium"
             findings.append(Finding(
                 tool="safety",
                 severity=severity,
@@ -211,8 +265,7 @@ def parse_gitleaks_json(filepath: str) -> list[Finding]:
     """Parse Gitleaks JSON output."""
     findings = []
     try:
-        with open(filepath) as f:
-            data = json.load(f)
+        data = _load_json(filepath)
 
         for leak in data if isinstance(data, list) else []:
             findings.append(Finding(
@@ -230,9 +283,21 @@ def parse_gitleaks_json(filepath: str) -> list[Finding]:
     return findings
 
 
+def _resolve_and_parse(
+    artifact_dir: str, file_patterns: list[str], parser: Callable[[str], list[Finding]]
+) -> list[Finding] | None:
+    """Parse the first artifact that exists, or return None if none do."""
+    base = os.fspath(artifact_dir)
+    for pattern in file_patterns:
+        filepath = os.path.join(base, pattern)
+        if os.path.isfile(filepath):
+            return parser(filepath)
+    return None
+
+
 def collect_findings(artifact_dir: str = ".") -> ScanResult:
     """Collect findings from all scan outputs."""
-    result = ScanResult()
+    result = ScanResult(scan_time=datetime.utcnow().isoformat())
 
     patterns = {
         "bandit": ["bandit-results/bandit-results.json", "bandit-results.json"],
@@ -250,84 +315,85 @@ def collect_findings(artifact_dir: str = ".") -> ScanResult:
         "gitleaks": parse_gitleaks_json,
     }
 
-    for tool, file_patterns in patterns.items():
-        found = False
-        for pattern in file_patterns:
-            filepath = Path(artifact_dir) / pattern
-            if filepath.exists():
-                findings = parsers[tool](str(filepath))
-                result.findings.extend(findings)
-                result.tool_status[tool] = f"Parsed ({len(findings)} findings)" if findings else "Clean"
-                found = True
-                break
-        if not found:
+    # Each tool's artifact is independent; read and parse them concurrently,
+    # then merge in the main thread in a stable tool order.
+    with ThreadPoolExecutor(max_workers=len(patterns)) as executor:
+        futures = {
+            tool: executor.submit(_resolve_and_parse, artifact_dir, file_patterns, parsers[tool])
+            for tool, file_patterns in patterns.items()
+        }
+
+    for tool, future in futures.items():
+        findings = future.result()
+        if findings is None:
             result.tool_status[tool] = "No results found"
+            continue
+        result.add_findings(findings)
+        result.tool_status[tool] = f"Parsed ({len(findings)} findings)" if findings else "Clean"
 
     return result
 
 
+def _render_summary(result: ScanResult) -> str:
+    """Title, severity table and tool status shared by every markdown report."""
+    return (
+        "# Security Scan Report\n\n"
+        f"**Generated:** {result.scan_time}\n\n"
+        "## Summary\n\n"
+        "| Severity | Count |\n"
+        "|----------|-------|\n"
+        f"| Critical | {result.critical_count} |\n"
+        f"| High | {result.high_count} |\n"
+        f"| Medium | {result.medium_count} |\n"
+        f"| Low | {result.low_count} |\n"
+        f"| Secrets | {'Yes' if result.secret_count else 'No'} |\n"
+        f"| **Total** | **{result.total_count}** |\n\n"
+        "## Tool Status\n\n"
+        + "".join(f"- {tool}: {status}\n" for tool, status in result.tool_status.items())
+        + "\n"
+    )
+
+
 def generate_markdown_report(result: ScanResult, verbose: bool = False) -> str:
     """Generate a markdown security report."""
+    if not result.total_count:
+        return _render_summary(result) + "**All clear!** No security findings detected.\n"
+
     has_secrets = result.secret_count > 0
-    lines = [
-        "# Security Scan Report",
-        "",
-        f"**Generated:** {result.scan_time}",
-        "",
-        "## Summary",
-        "",
-        "| Severity | Count |",
-        "|----------|-------|",
-        f"| Critical | {result.critical_count} |",
-        f"| High | {result.high_count} |",
-        f"| Medium | {result.medium_count} |",
-        f"| Low | {result.low_count} |",
-        f"| Secrets | {'Yes' if has_secrets else 'No'} |",
-        f"| **Total** | **{result.total_count}** |",
-        "",
-        "## Tool Status",
-        "",
-    ]
-
-    for tool, status in result.tool_status.items():
-        lines.append(f"- {tool}: {status}")
-
-    lines.append("")
-
-    critical_high = [f for f in result.findings if f.severity in ("critical", "high")]
+    buf = io.StringIO()
+    w = buf.write
+    w(_render_summary(result))
+
+    critical_high = result.of_severity("critical") + result.of_severity("high")
     if critical_high:
-        lines.extend(["## Critical & High Severity Findings", ""])
+        w("## Critical & High Severity Findings\n\n")
         for finding in critical_high:
-            lines.extend([
-                f"### [{finding.tool.upper()}] {finding.title}",
-                f"- **Severity:** {finding.severity.upper()}",
-                f"- **Category:** {finding.category}",
-            ])
+            w(
+                f"### [{finding.tool.upper()}] {finding.title}\n"
+                f"- **Severity:** {finding.severity.upper()}\n"
+                f"- **Category:** {finding.category}\n"
+            )
             if finding.file:
-                lines.append(f"- **Location:** `{finding.file}:{finding.line}`")
+                w(f"- **Location:** `{finding.file}:{finding.line}`\n")
             if finding.cve:
-                lines.append(f"- **CVE:** {finding.cve}")
+                w(f"- **CVE:** {finding.cve}\n")
             if finding.remediation:
-                lines.append(f"- **Remediation:** {finding.remediation}")
-            lines.append("")
+                w(f"- **Remediation:** {finding.remediation}\n")
+            w("\n")
 
     if has_secrets:
-        lines.extend([
-            "## Secrets Detected",
-            "",
-            "**IMMEDIATE ACTION REQUIRED**: Rotate all exposed secrets!",
-            "",
-        ])
-
-    if result.total_count == 0:
-        lines.append("**All clear!** No security findings detected.")
+        w(
+            "## Secrets Detected\n\n"
+            "**IMMEDIATE ACTION REQUIRED**: Rotate all exposed secrets!\n\n"
+        )
 
-    return "\n".join(lines)
+    # Section writers each end with a blank line; keep a single final newline
+    return buf.getvalue().rstrip("\n") + "\n"
 
 
 def generate_json_report(result: ScanResult) -> str:
     """Generate a JSON security report."""
-    return json.dumps({
+    report = {
         "scan_time": result.scan_time,
         "summary": {
             "critical": result.critical_count,
@@ -351,27 +417,42 @@ def generate_json_report(result: ScanResult) -> str:
             for f in result.findings
             if f.category != "secret"  # Don't include secret details in JSON
         ],
-    }, indent=2)
-
-
-def check_failure_policy(result: ScanResult, fail_on: list[str]) -> tuple[bool, str]:
-    """Check if the scan should fail based on policy."""
-    if "any" in fail_on and result.total_count > 0:
+    }
+    if HAS_ORJSON:
+        return orjson.dumps(report, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(report, indent=2)
+
+
+def compile_fail_policy(fail_on: list[str]) -> int:
+    """Compile ``--fail-on`` names into a bitmask; unknown names are ignored."""
+    mask = 0
+    for name in fail_on:
+        mask |= _POLICY_BITS.get(name, 0)
+    return mask
+
+
+def _result_mask(result: ScanResult) -> int:
+    mask = 0
+    if result.total_count:
+        mask |= _POLICY_BITS["any"]
+    if result.secret_count:
+        mask |= _POLICY_BITS["secret"]
+    for severity in ("critical", "high", "medium", "low"):
+        if result.of_severity(severity):
+            mask |= _POLICY_BITS[severity]
+    return mask
+
+
+def check_failure_policy(result: ScanResult, policy_mask: int) -> tuple[bool, str]:
+    """Check if the scan should fail based on a compiled policy mask."""
+    if not result.total_count:
+        return False, "passed"
+    violated = policy_mask & _result_mask(result)
+    if not violated:
+        return False, "passed"
+    if violated & _POLICY_BITS["any"]:
         return True, "findings detected"
-
-    has_failure = False
-    if "secret" in fail_on and result.secret_count > 0:
-        has_failure = True
-    if "critical" in fail_on and result.critical_count > 0:
-        has_failure = True
-    if "high" in fail_on and result.high_count > 0:
-        has_failure = True
-    if "medium" in fail_on and result.medium_count > 0:
-        has_failure = True
-
-    if has_failure:
-        return True, "policy violation"
-    return False, "passed"
+    return True, "policy violation"
 
 
 def main():
@@ -393,20 +474,26 @@ def main():
         report = generate_markdown_report(result, verbose=args.verbose)
         output_file = args.output
 
-    with open(output_file, "w") as f:
+    with open(output_file, "w", encoding="utf-8") as f:
         f.write(report)
 
     if args.github_output:
         github_output = os.environ.get("GITHUB_OUTPUT", "")
         if github_output:
-            with open(github_output, "a") as f:
-                f.write(f"critical_count={result.critical_count}\n")
-                f.write(f"high_count={result.high_count}\n")
-                f.write(f"total_count={result.total_count}\n")
+            outputs = (
+                f"critical_count={result.critical_count}\n"
+                f"high_count={result.high_count}\n"
+                f"medium_count={result.medium_count}\n"
+                f"low_count={result.low_count}\n"
+                f"secret_count={result.secret_count}\n"
+                f"total_count={result.total_count}\n"
+            )
+            with open(github_output, "a", encoding="utf-8") as f:
+                f.write(outputs)
 
     if args.fail_on:
         fail_severities = [s.strip().lower() for s in args.fail_on.split(",")]
-        should_fail, reason = check_failure_policy(result, fail_severities)
+        should_fail, reason = check_failure_policy(result, compile_fail_policy(fail_severities))
         if should_fail:
             sys.exit(1)
 
@@ -7,6 +7,7 @@ and provides instructions for using the MCP Inspector.
 """
 
 import asyncio
+import os
 import subprocess
 import sys
 import time
@@ -53,6 +54,22 @@ def test_stdio_mode():
         return False
 
 
+async def wait_for_port(host: str, port: int, process, timeout: float = 20.0) -> bool:
+    """Poll until the server accepts TCP connections, it exits, or the timeout expires."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline and process.returncode is None:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            await asyncio.sleep(0.1)
+        else:
+            writer.close()
+            await writer.wait_closed()
+            return True
+    return False
+
+
 async def test_http_mode():
     """Test the MCP server in HTTP mode."""
     print("\n🌐 Testing HTTP Mode")
@@ -66,17 +83,18 @@ async def test_http_mode():
         print(f"Command: {' '.join(cmd)}")
         print("Starting server in HTTP mode on port 8005...")
 
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        # Output is never read; discard it so a chatty server cannot fill a pipe and stall
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
             cwd=project_root,
-            env={"MCP_SERVER_PORT": "8005"},
+            env={**os.environ, "MCP_SERVER_PORT": "8005"},
         )
 
-        # Wait for server to start
-        await asyncio.sleep(8)
+        # Wait for server to start accepting connections
+        if not await wait_for_port("localhost", 8005, process):
+            print("⚠️  Server exited or did not open port 8005 in time")
 
         # Test the server
         try:
@@ -95,11 +113,13 @@ async def test_http_mode():
             print(f"❌ HTTP mode client error: {e}")
             success = False
         finally:
-            process.terminate()
-            try:
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                process.kill()
+            if process.returncode is None:
+                process.terminate()
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
 
         return success
 
@@ -214,5 +234,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    success = asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        success = asyncio.run(main())
+    else:
+        success = uvloop.run(main())
     sys.exit(0 if success else 1)
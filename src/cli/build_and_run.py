@@ -9,12 +9,16 @@ feature (local setup, Splunk config, server run, Docker mode, stop, etc.).
 from __future__ import annotations
 
 import argparse
+import functools
 import os
+import re
+import select
 import shlex
 import shutil
 import signal
 import subprocess  # nosec B404 - CLI tool requires subprocess for Docker/process management
 import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -26,25 +30,32 @@ COLOR_BLUE = "\033[0;34m"
 COLOR_PURPLE = "\033[0;35m"
 COLOR_RESET = "\033[0m"
 
+# Message prefixes, formatted once
+_STATUS_PREFIX = f"{COLOR_BLUE}[INFO]{COLOR_RESET} "
+_SUCCESS_PREFIX = f"{COLOR_GREEN}[SUCCESS]{COLOR_RESET} "
+_WARNING_PREFIX = f"{COLOR_YELLOW}[WARNING]{COLOR_RESET} "
+_ERROR_PREFIX = f"{COLOR_RED}[ERROR]{COLOR_RESET} "
+_LOCAL_PREFIX = f"{COLOR_PURPLE}[LOCAL]{COLOR_RESET} "
+
 
 def print_status(message: str) -> None:
-    print(f"{COLOR_BLUE}[INFO]{COLOR_RESET} {message}")
+    sys.stdout.write(f"{_STATUS_PREFIX}{message}\n")
 
 
 def print_success(message: str) -> None:
-    print(f"{COLOR_GREEN}[SUCCESS]{COLOR_RESET} {message}")
+    sys.stdout.write(f"{_SUCCESS_PREFIX}{message}\n")
 
 
 def print_warning(message: str) -> None:
-    print(f"{COLOR_YELLOW}[WARNING]{COLOR_RESET} {message}")
+    sys.stdout.write(f"{_WARNING_PREFIX}{message}\n")
 
 
 def print_error(message: str) -> None:
-    print(f"{COLOR_RED}[ERROR]{COLOR_RESET} {message}")
+    sys.stdout.write(f"{_ERROR_PREFIX}{message}\n")
 
 
 def print_local(message: str) -> None:
-    print(f"{COLOR_PURPLE}[LOCAL]{COLOR_RESET} {message}")
+    sys.stdout.write(f"{_LOCAL_PREFIX}{message}\n")
 
 
 @dataclass
@@ -162,12 +173,56 @@ def check_docker_available() -> bool:
     return shutil.which("docker") is not None
 
 
+# Remembers which docker binary last passed the `docker compose version` probe
+COMPOSE_PROBE_CACHE_TTL = 3600.0
+
+
+def _compose_probe_cache() -> Path:
+    xdg_cache = os.environ.get("XDG_CACHE_HOME", "")
+    base = Path(xdg_cache) if os.path.isabs(xdg_cache) else Path.home() / ".cache"
+    return base / "mcp-for-splunk" / "docker-compose-probe"
+
+
+def _compose_probe_cached(docker_path: str) -> bool:
+    """Return True if `docker compose` recently worked with this docker binary."""
+    cache = _compose_probe_cache()
+    try:
+        if time.time() - cache.stat().st_mtime > COMPOSE_PROBE_CACHE_TTL:
+            return False
+        return cache.read_text(encoding="utf-8") == docker_path
+    except (OSError, RuntimeError):
+        return False
+
+
+def _store_compose_probe(docker_path: str) -> None:
+    cache = _compose_probe_cache()
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        cache.write_text(docker_path, encoding="utf-8")
+    except (OSError, RuntimeError):
+        pass  # Intentionally suppressed: the cache only saves a probe
+
+
+def _forget_compose_probe(cmd: list[str]) -> None:
+    """Drop the cached probe after a failed `docker compose` call so the next run re-probes."""
+    if cmd[:2] == ["docker", "compose"]:
+        try:
+            _compose_probe_cache().unlink(missing_ok=True)
+        except (OSError, RuntimeError):
+            pass  # Intentionally suppressed: the cache only saves a probe
+
+
 def check_compose_available() -> tuple[bool, list[str]]:
     """Return whether a compose command is available and the base command list.
 
-    Prefers `docker compose`, falls back to `docker-compose`.
+    Prefers `docker compose`, falls back to `docker-compose`. A successful
+    `docker compose` probe is cached for an hour per docker binary, or until a
+    `docker compose` call fails.
     """
-    if shutil.which("docker") is not None:
+    docker_path = shutil.which("docker")
+    if docker_path is not None:
+        if _compose_probe_cached(docker_path):
+            return True, ["docker", "compose"]
         # Verify `docker compose` subcommand works
         code = subprocess.run(  # nosec B603 B607
             ["docker", "compose", "version"],
@@ -176,6 +231,7 @@ def check_compose_available() -> tuple[bool, list[str]]:
             check=False,
         ).returncode
         if code == 0:
+            _store_compose_probe(docker_path)
             return True, ["docker", "compose"]
     if shutil.which("docker-compose") is not None:
         return True, ["docker-compose"]
@@ -215,12 +271,25 @@ def run_cmd(cmd: list[str], cwd: str | None = None) -> int:
         result = subprocess.run(  # nosec B603 B607
             cmd, cwd=cwd, check=False
         )
+        if result.returncode != 0:
+            _forget_compose_probe(cmd)
         return result.returncode
     except FileNotFoundError:
         print_error(f"Command not found: {cmd[0]}")
         return 127
 
 
+def mcp_test_cmd(detailed: bool = False) -> list[str]:
+    """Command for the MCP server test; skips ``uv run`` when already inside a virtualenv."""
+    if sys.prefix != sys.base_prefix:
+        cmd = [sys.executable, "src/cli/test_mcp_server.py"]
+    else:
+        cmd = ["uv", "run", "python", "src/cli/test_mcp_server.py"]
+    if detailed:
+        cmd.append("--detailed")
+    return cmd
+
+
 def ensure_logs_dir() -> None:
     logs_dir = Path("logs")
     if not logs_dir.exists():
@@ -877,10 +946,7 @@ def run_local_server(
 
         if run_test:
             print_status("Running MCP server test...")
-            test_cmd = ["uv", "run", "python", "src/cli/test_mcp_server.py"]
-            if detailed:
-                test_cmd.append("--detailed")
-            run_cmd(test_cmd)
+            run_cmd(mcp_test_cmd(detailed))
 
         return 0  # Exit main script immediately after starting detached and optional test
 
@@ -965,6 +1031,8 @@ def stop_docker_services() -> int:
             out = subprocess.run(  # nosec B603 B607
                 ps_services_cmd, capture_output=True, text=True, check=False
             )
+            if out.returncode != 0:
+                _forget_compose_probe(ps_services_cmd)
             running_services = [line for line in out.stdout.strip().splitlines() if line.strip()]
         except FileNotFoundError:
             running_services = []
@@ -989,18 +1057,8 @@ def stop_docker_services() -> int:
             overall_rc = rc
             continue
 
-        # Verify after stopping targets
-        out2 = subprocess.run(  # nosec B603 B607
-            ps_services_cmd, capture_output=True, text=True, check=False
-        )
-        remaining_services = [line for line in out2.stdout.strip().splitlines() if line.strip()]
-        remaining_expected = [s for s in remaining_services if s in expected]
-        if remaining_expected:
-            print_warning(
-                f"{cf}: Some project services still running: {', '.join(remaining_expected)}"
-            )
-        else:
-            print_success(f"{cf}: Project services stopped.")
+        # `compose stop` only exits 0 once the targets have stopped, so no re-check is needed
+        print_success(f"{cf}: Project services stopped.")
 
     if not any_found:
         print_status("No compose files found to stop (nothing to do).")
@@ -1008,9 +1066,129 @@ def stop_docker_services() -> int:
     return overall_rc
 
 
+# PID-per-line output of pgrep/lsof -t
+_PID_RE = re.compile(rb"\d+")
+
+
+def _parse_pids(output: bytes) -> list[int]:
+    return [int(m.group()) for m in _PID_RE.finditer(output)]
+
+
+@functools.cache
+def _which(name: str) -> str | None:
+    """``shutil.which`` cached for the stop path, where the same tools are looked up repeatedly."""
+    return shutil.which(name)
+
+
+def _pgrep_pids(patterns: list[str]) -> set[int]:
+    """Return PIDs whose command line matches any pattern, using a single ``pgrep -f`` call.
+
+    One alternation keeps it to one process; concurrent pgrep runs would match
+    each other's command lines.
+    """
+    if _which("pgrep") is None:
+        return set()
+    out = subprocess.run(  # nosec B603 B607
+        ["pgrep", "-f", "|".join(patterns)], capture_output=True, check=False
+    )
+    return set(_parse_pids(out.stdout)) if out.returncode == 0 else set()
+
+
+def _scan_proc(patterns: list[str]) -> set[int]:
+    """Return PIDs whose command line contains any pattern, read directly from /proc."""
+    needles = [pat.encode() for pat in patterns]
+    own_pid = str(os.getpid())
+    pids: set[int] = set()
+    with os.scandir("/proc") as entries:
+        for entry in entries:
+            if not entry.name.isdigit() or entry.name == own_pid:
+                continue
+            try:
+                with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                    cmdline = f.read().replace(b"\0", b" ")
+            except OSError:
+                continue  # Process exited or is not readable
+            if any(needle in cmdline for needle in needles):
+                pids.add(int(entry.name))
+    return pids
+
+
+def _find_pids(patterns: list[str]) -> set[int]:
+    """Return PIDs matching any pattern; scans /proc on Linux and uses pgrep elsewhere."""
+    if sys.platform == "linux":
+        try:
+            return _scan_proc(patterns)
+        except OSError:
+            pass  # /proc not mounted or not readable; fall back to pgrep
+    return _pgrep_pids(patterns)
+
+
+def _cmdline(pid: int) -> bytes:
+    """Return the command line of ``pid``, or ``b""`` if it cannot be read."""
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return f.read().replace(b"\0", b" ")
+    except OSError:
+        pass  # No /proc (macOS) or the process is gone
+    if _which("ps") is None:
+        return b""
+    out = subprocess.run(  # nosec B603 B607
+        ["ps", "-o", "command=", "-p", str(pid)], capture_output=True, check=False
+    )
+    return out.stdout
+
+
+def _signal_group(pid: int, sig: int, patterns: list[str]) -> None:
+    """Signal the process group led by ``pid`` (see start_new_session), else just ``pid``.
+
+    The group is only signalled while ``pid`` still runs a command matching
+    ``patterns``, so a stale PID file whose PID was reused cannot take down an
+    unrelated process group.
+    """
+    if (
+        hasattr(os, "killpg")
+        and os.getpgid(pid) == pid
+        and any(pat.encode() in _cmdline(pid) for pat in patterns)
+    ):
+        os.killpg(pid, sig)
+    else:
+        os.kill(pid, sig)
+
+
+def _wait_exit(pid: int, timeout: float = 3.0) -> bool:
+    """Wait for ``pid`` to exit; return False if it is still running after ``timeout`` seconds."""
+    if hasattr(os, "pidfd_open"):
+        try:
+            fd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            pass  # Kernel without pidfd support; fall back to polling
+        else:
+            try:
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
+                return bool(poller.poll(timeout * 1000))
+            finally:
+                os.close(fd)
+
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    while True:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass  # Still running under another user
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+
 def stop_local_processes() -> int:
     base_dir = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-    os.chdir(base_dir)
 
     # Stop by PID file if present
     pid_file = base_dir / ".mcp_local_server.pid"
@@ -1030,36 +1208,19 @@ def stop_local_processes() -> int:
         "fastmcp run src/server.py",
         "fastmcp run",
     ]
-    for pat in patterns:
-        if shutil.which("pgrep") is not None:
-            out = subprocess.run(  # nosec B603 B607
-                ["pgrep", "-f", pat], capture_output=True, text=True, check=False
-            )
-            if out.returncode == 0 and out.stdout:
-                for line in out.stdout.strip().splitlines():
-                    try:
-                        initial_pids.add(int(line.strip()))
-                    except ValueError:
-                        continue
+    initial_pids |= _find_pids(patterns)
+    inspector_patterns = ["@modelcontextprotocol/inspector"]
 
     if pid_file.exists():
         try:
             pid_str = pid_file.read_text(encoding="utf-8").strip()
             pid = int(pid_str)
             print_status(f"Stopping local MCP Server (PID {pid})...")
-            os.kill(pid, signal.SIGTERM)
+            _signal_group(pid, signal.SIGTERM, patterns)
             # Wait briefly for termination
-            for _ in range(10):
-                try:
-                    os.kill(pid, 0)
-                    import time as _t
-
-                    _t.sleep(0.3)
-                except ProcessLookupError:
-                    break
-            else:
+            if not _wait_exit(pid):
                 print_warning("Process did not exit after SIGTERM; sending SIGKILL...")
-                os.kill(pid, signal.SIGKILL)
+                _signal_group(pid, signal.SIGKILL, patterns)
             pid_file.unlink(missing_ok=True)
             print_success("Local MCP Server stopped.")
         except (OSError, ValueError) as e:
@@ -1071,19 +1232,11 @@ def stop_local_processes() -> int:
             ipid_str = inspector_pid_file.read_text(encoding="utf-8").strip()
             ipid = int(ipid_str)
             print_status(f"Stopping MCP Inspector (PID {ipid})...")
-            os.kill(ipid, signal.SIGTERM)
+            _signal_group(ipid, signal.SIGTERM, inspector_patterns)
             # Wait briefly for inspector termination
-            for _ in range(10):
-                try:
-                    os.kill(ipid, 0)
-                    import time as _t
-
-                    _t.sleep(0.3)
-                except ProcessLookupError:
-                    break
-            else:
+            if not _wait_exit(ipid):
                 print_warning("Inspector did not exit after SIGTERM; sending SIGKILL...")
-                os.kill(ipid, signal.SIGKILL)
+                _signal_group(ipid, signal.SIGKILL, inspector_patterns)
             inspector_pid_file.unlink(missing_ok=True)
             print_success("MCP Inspector stopped.")
         except (OSError, ValueError) as e:
@@ -1104,112 +1257,78 @@ def stop_local_processes() -> int:
         port_open = False
 
     if port_open:
-        if shutil.which("lsof"):
+        if _which("lsof"):
             out = subprocess.run(  # nosec B603 B607
-                ["lsof", "-t", "-i", ":6274"], capture_output=True, text=True, check=False
+                ["lsof", "-t", "-i", ":6274"], capture_output=True, check=False
             )
-            pids = [line.strip() for line in out.stdout.splitlines() if line.strip()]
-            for pid_str in pids:
+            for pid in _parse_pids(out.stdout):
                 try:
-                    pid = int(pid_str)
                     print_status(f"Stopping MCP Inspector (port 6274) PID {pid}...")
                     os.kill(pid, signal.SIGTERM)
                     print_success("MCP Inspector stop signal sent.")
-                except (ValueError, OSError):
+                except OSError:
                     continue
         else:
-            if shutil.which("fuser"):
+            if _which("fuser"):
                 print_status("Using fuser to kill processes on port 6274...")
                 subprocess.run(  # nosec B603 B607
                     ["fuser", "-k", "6274/tcp"], check=False
                 )
-            elif shutil.which("pkill"):
+            elif _which("pkill"):
                 print_status("Trying pkill -f '@modelcontextprotocol/inspector'...")
                 subprocess.run(  # nosec B603 B607
                     ["pkill", "-f", "@modelcontextprotocol/inspector"], check=False
                 )
-            elif shutil.which("pgrep") and shutil.which("kill"):
-                out = subprocess.run(  # nosec B603 B607
-                    ["pgrep", "-f", "@modelcontextprotocol/inspector"],
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                )
-                if out.returncode == 0 and out.stdout:
-                    for line in out.stdout.strip().splitlines():
-                        try:
-                            pid = int(line.strip())
-                            print_status(
-                                f"Killing Inspector PID {pid} matching '@modelcontextprotocol/inspector'..."
-                            )
-                            os.kill(pid, signal.SIGTERM)
-                        except (ValueError, OSError):
-                            continue
+            elif _which("pgrep") and _which("kill"):
+                for pid in sorted(_pgrep_pids(inspector_patterns)):
+                    try:
+                        print_status(
+                            f"Killing Inspector PID {pid} matching '@modelcontextprotocol/inspector'..."
+                        )
+                        os.kill(pid, signal.SIGTERM)
+                    except OSError:
+                        continue
 
         # After attempting to stop inspector by port/name, remove stale pid file if present
         inspector_pid_file.unlink(missing_ok=True)
 
-    # Fall back to pkill for fastmcp patterns
-    for pat in patterns:
-        if shutil.which("pkill") is not None:
-            print_status(f"Trying pkill -f '{pat}'...")
-            subprocess.run(  # nosec B603 B607
-                ["pkill", "-f", pat], check=False
-            )
-        else:
-            if shutil.which("pgrep") and shutil.which("kill"):
-                out = subprocess.run(  # nosec B603 B607
-                    ["pgrep", "-f", pat], capture_output=True, text=True, check=False
-                )
-                if out.returncode == 0 and out.stdout:
-                    for line in out.stdout.strip().splitlines():
-                        try:
-                            pid = int(line.strip())
-                            print_status(f"Killing PID {pid} matching '{pat}'...")
-                            os.kill(pid, signal.SIGTERM)
-                        except (ValueError, OSError):
-                            continue
-
-    # Small grace period to allow processes to exit cleanly before verification
-    try:
-        import time as _t
-
-        _t.sleep(0.5)
-    except (ImportError, RuntimeError, OSError):
-        pass  # Intentionally suppressed: grace period is best-effort
-
-    # Verify post-state
-    remaining_pids: set[int] = set()
-    if pid_file.exists():
+    # Fall back to signalling fastmcp processes by command line
+    proc_pids: set[int] | None = None
+    if sys.platform == "linux":
         try:
-            p_str = pid_file.read_text(encoding="utf-8").strip()
-            p = int(p_str)
-            remaining_pids.add(p)
-        except (OSError, ValueError):
-            pass  # Intentionally suppressed: PID file may be corrupt or missing
-    for pat in patterns:
-        if shutil.which("pgrep") is not None:
-            out = subprocess.run(  # nosec B603 B607
-                ["pgrep", "-f", pat], capture_output=True, text=True, check=False
-            )
-            if out.returncode == 0 and out.stdout:
-                for line in out.stdout.strip().splitlines():
+            proc_pids = _scan_proc(patterns)
+        except OSError:
+            pass  # /proc not mounted or not readable; use pkill/pgrep below
+    if proc_pids is not None:
+        for pid in sorted(proc_pids):
+            try:
+                print_status(f"Killing fastmcp PID {pid}...")
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                continue
+    else:
+        for pat in patterns:
+            if _which("pkill") is not None:
+                print_status(f"Trying pkill -f '{pat}'...")
+                subprocess.run(  # nosec B603 B607
+                    ["pkill", "-f", pat], check=False
+                )
+            else:
+                for pid in sorted(_pgrep_pids([pat])):
                     try:
-                        remaining_pids.add(int(line.strip()))
-                    except ValueError:
+                        print_status(f"Killing PID {pid} matching '{pat}'...")
+                        os.kill(pid, signal.SIGTERM)
+                    except OSError:
                         continue
 
-    # Confirm candidates are truly alive (avoid false positives from zombie/exited processes)
-    alive_remaining: set[int] = set()
-    for pid in list(remaining_pids):
-        try:
-            os.kill(pid, 0)  # raises ProcessLookupError if not running
-            alive_remaining.add(pid)
-        except ProcessLookupError:
-            continue
-        except PermissionError:
-            # If we lack permission, assume it's alive to be safe
-            alive_remaining.add(pid)
+    # Verify post-state: give the processes found up front a shared 0.5s grace
+    # period to exit, without re-scanning for them
+    deadline = time.monotonic() + 0.5
+    alive_remaining = {
+        pid
+        for pid in initial_pids
+        if not _wait_exit(pid, max(0.0, deadline - time.monotonic()))
+    }
 
     initially_running = len(initial_pids)
     now_running = len(alive_remaining)
@@ -1343,8 +1462,7 @@ def run_docker_setup(run_test: bool = False) -> int:
 
     if run_test:
         print_status("Running MCP server test...")
-        test_cmd = ["uv", "run", "python", "src/cli/test_mcp_server.py", "--detailed"]
-        run_cmd(test_cmd)
+        run_cmd(mcp_test_cmd(detailed=True))
 
     return 0
 
@@ -1372,10 +1490,7 @@ def main(argv: list[str] | None = None) -> int:
     # Handle standalone --test first (no startup)
     if args.test and not (args.force_docker or args.force_local or args.restart or args.stop):
         print_status("Running standalone MCP server test...")
-        test_cmd = ["uv", "run", "python", "src/cli/test_mcp_server.py"]
-        if args.detailed:
-            test_cmd.append("--detailed")
-        return run_cmd(test_cmd)
+        return run_cmd(mcp_test_cmd(args.detailed))
 
     # Handle forced modes first
     if args.stop:
@@ -6,9 +6,9 @@ Install with: pip install mcp-server-for-splunk[sentry]
 """
 
 from .config import (
-    _sentry_initialized,
     _sentry_sdk_available,
     init_sentry,
+    is_initialized,
     is_sentry_enabled,
     mcp_request_id,
     mcp_session_id,
@@ -33,8 +33,8 @@ from .mcp_middleware import SentryMCPMiddleware, create_sentry_middlewares
 __all__ = [
     # Config
     "_sentry_sdk_available",
-    "_sentry_initialized",
     "init_sentry",
+    "is_initialized",
     "is_sentry_enabled",
     "mcp_session_id",
     "mcp_request_id",
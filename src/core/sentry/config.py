@@ -22,6 +22,11 @@ mcp_request_id: ContextVar[str | None] = ContextVar("mcp_request_id", default=No
 mcp_tool_name: ContextVar[str | None] = ContextVar("mcp_tool_name", default=None)
 
 
+def is_initialized() -> bool:
+    """Return whether init_sentry() has completed; read at call time, not import time."""
+    return _sentry_initialized
+
+
 def is_sentry_enabled() -> bool:
     """Check if Sentry is enabled via environment configuration and SDK is available."""
     if not _sentry_sdk_available:
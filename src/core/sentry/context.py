@@ -5,9 +5,10 @@ from contextlib import contextmanager
 from typing import Any
 
 from .config import (
-    _sentry_initialized,
+    is_initialized,
     mcp_request_id,
     mcp_session_id,
+    sentry_sdk,
 )
 
 logger = logging.getLogger(__name__)
@@ -16,13 +17,11 @@ logger = logging.getLogger(__name__)
 @contextmanager
 def mcp_span(op: str, name: str, description: str | None = None, **attributes: Any):
     """Create an MCP-specific span for tracing operations."""
-    if not _sentry_initialized:
+    if not is_initialized():
         yield None
         return
 
     try:
-        import sentry_sdk
-
         with sentry_sdk.start_span(op=op, name=name, description=description) as span:
             for key, value in attributes.items():
                 if value:
@@ -46,12 +45,10 @@ def set_mcp_context(
     Call this at the start of request processing to enrich all
     subsequent spans and error events with MCP context.
     """
-    if not _sentry_initialized:
+    if not is_initialized():
         return
 
     try:
-        import sentry_sdk
-
         if session_id:
             mcp_session_id.set(session_id)
         if request_id:
@@ -82,12 +79,10 @@ def capture_mcp_error(
 
     Use this to manually capture exceptions with rich MCP metadata.
     """
-    if not _sentry_initialized:
+    if not is_initialized():
         return
 
     try:
-        import sentry_sdk
-
         with sentry_sdk.push_scope() as scope:
             scope.set_tag("mcp.error.source", "manual")
 
@@ -125,12 +120,10 @@ def add_breadcrumb(
     Breadcrumbs appear in error reports and help understand
     the sequence of events leading to an error.
     """
-    if not _sentry_initialized:
+    if not is_initialized():
         return
 
     try:
-        import sentry_sdk
-
         sentry_sdk.add_breadcrumb(
             message=message,
             category=category,
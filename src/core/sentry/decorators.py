@@ -7,7 +7,7 @@ import logging
 from collections.abc import Callable
 from typing import Any, TypeVar
 
-from .config import _sentry_initialized, mcp_session_id, mcp_tool_name
+from .config import is_initialized, mcp_session_id, mcp_tool_name, sentry_sdk
 
 logger = logging.getLogger(__name__)
 
@@ -44,83 +44,71 @@ def trace_mcp_tool(tool_name: str | None = None):
 
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            if not _sentry_initialized:
+            if not is_initialized():
                 return await func(*args, **kwargs)
 
-            try:
-                import sentry_sdk
-
-                token = mcp_tool_name.set(name)
-
-                try:
-                    with sentry_sdk.start_span(
-                        op="mcp.tool",
-                        name=f"tools/call {name}",
-                        description=f"Execute MCP tool: {name}",
-                    ) as span:
-                        span.set_data("mcp.tool.name", name)
-                        span.set_data("mcp.method.name", "tools/call")
+            token = mcp_tool_name.set(name)
 
-                        session_id = mcp_session_id.get()
-                        if session_id:
-                            span.set_data("mcp.session.id", session_id)
+            try:
+                with sentry_sdk.start_span(
+                    op="mcp.tool",
+                    name=f"tools/call {name}",
+                    description=f"Execute MCP tool: {name}",
+                ) as span:
+                    span.set_data("mcp.tool.name", name)
+                    span.set_data("mcp.method.name", "tools/call")
 
-                        sanitized_kwargs = _sanitize_kwargs(kwargs)
-                        span.set_data("mcp.tool.arguments", sanitized_kwargs)
+                    session_id = mcp_session_id.get()
+                    if session_id:
+                        span.set_data("mcp.session.id", session_id)
 
-                        try:
-                            result = await func(*args, **kwargs)
-                            span.set_data("mcp.tool.status", "success")
+                    sanitized_kwargs = _sanitize_kwargs(kwargs)
+                    span.set_data("mcp.tool.arguments", sanitized_kwargs)
 
-                            if isinstance(result, dict):
-                                span.set_data("mcp.tool.result_keys", list(result.keys()))
+                    try:
+                        result = await func(*args, **kwargs)
+                        span.set_data("mcp.tool.status", "success")
 
-                            return result
+                        if isinstance(result, dict):
+                            span.set_data("mcp.tool.result_keys", list(result.keys()))
 
-                        except Exception as e:
-                            span.set_data("mcp.tool.status", "error")
-                            span.set_data("mcp.tool.error_type", type(e).__name__)
-                            span.set_status("internal_error")
-                            sentry_sdk.capture_exception(e)
-                            raise
+                        return result
 
-                finally:
-                    mcp_tool_name.reset(token)
+                    except Exception as e:
+                        span.set_data("mcp.tool.status", "error")
+                        span.set_data("mcp.tool.error_type", type(e).__name__)
+                        span.set_status("internal_error")
+                        sentry_sdk.capture_exception(e)
+                        raise
 
-            except ImportError:
-                return await func(*args, **kwargs)
+            finally:
+                mcp_tool_name.reset(token)
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            if not _sentry_initialized:
+            if not is_initialized():
                 return func(*args, **kwargs)
 
-            try:
-                import sentry_sdk
+            token = mcp_tool_name.set(name)
 
-                token = mcp_tool_name.set(name)
+            try:
+                with sentry_sdk.start_span(
+                    op="mcp.tool",
+                    name=f"tools/call {name}",
+                ) as span:
+                    span.set_data("mcp.tool.name", name)
 
-                try:
-                    with sentry_sdk.start_span(
-                        op="mcp.tool",
-                        name=f"tools/call {name}",
-                    ) as span:
-                        span.set_data("mcp.tool.name", name)
-
-                        try:
-                            result = func(*args, **kwargs)
-                            span.set_data("mcp.tool.status", "success")
-                            return result
-                        except Exception as e:
-                            span.set_data("mcp.tool.status", "error")
-                            span.set_status("internal_error")
-                            sentry_sdk.capture_exception(e)
-                            raise
-                finally:
-                    mcp_tool_name.reset(token)
-
-            except ImportError:
-                return func(*args, **kwargs)
+                    try:
+                        result = func(*args, **kwargs)
+                        span.set_data("mcp.tool.status", "success")
+                        return result
+                    except Exception as e:
+                        span.set_data("mcp.tool.status", "error")
+                        span.set_status("internal_error")
+                        sentry_sdk.capture_exception(e)
+                        raise
+            finally:
+                mcp_tool_name.reset(token)
 
         if _is_coroutine_function(func):
             return async_wrapper  # type: ignore
@@ -137,62 +125,50 @@ def trace_mcp_resource(resource_uri: str | None = None):
 
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            if not _sentry_initialized:
+            if not is_initialized():
                 return await func(*args, **kwargs)
 
-            try:
-                import sentry_sdk
+            with sentry_sdk.start_span(
+                op="mcp.resource",
+                name=f"resources/read {uri}",
+                description=f"Read MCP resource: {uri}",
+            ) as span:
+                span.set_data("mcp.resource.uri", uri)
+                span.set_data("mcp.method.name", "resources/read")
 
-                with sentry_sdk.start_span(
-                    op="mcp.resource",
-                    name=f"resources/read {uri}",
-                    description=f"Read MCP resource: {uri}",
-                ) as span:
-                    span.set_data("mcp.resource.uri", uri)
-                    span.set_data("mcp.method.name", "resources/read")
-
-                    try:
-                        result = await func(*args, **kwargs)
-                        span.set_data("mcp.resource.status", "success")
-
-                        if isinstance(result, str):
-                            span.set_data("mcp.resource.size_bytes", len(result.encode()))
+                try:
+                    result = await func(*args, **kwargs)
+                    span.set_data("mcp.resource.status", "success")
 
-                        return result
-                    except Exception as e:
-                        span.set_data("mcp.resource.status", "error")
-                        span.set_status("internal_error")
-                        sentry_sdk.capture_exception(e)
-                        raise
+                    if isinstance(result, str):
+                        span.set_data("mcp.resource.size_bytes", len(result.encode()))
 
-            except ImportError:
-                return await func(*args, **kwargs)
+                    return result
+                except Exception as e:
+                    span.set_data("mcp.resource.status", "error")
+                    span.set_status("internal_error")
+                    sentry_sdk.capture_exception(e)
+                    raise
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            if not _sentry_initialized:
+            if not is_initialized():
                 return func(*args, **kwargs)
 
-            try:
-                import sentry_sdk
-
-                with sentry_sdk.start_span(
-                    op="mcp.resource",
-                    name=f"resources/read {uri}",
-                ) as span:
-                    span.set_data("mcp.resource.uri", uri)
+            with sentry_sdk.start_span(
+                op="mcp.resource",
+                name=f"resources/read {uri}",
+            ) as span:
+                span.set_data("mcp.resource.uri", uri)
 
-                    try:
-                        result = func(*args, **kwargs)
-                        span.set_data("mcp.resource.status", "success")
-                        return result
-                    except Exception as e:
-                        span.set_data("mcp.resource.status", "error")
-                        sentry_sdk.capture_exception(e)
-                        raise
-
-            except ImportError:
-                return func(*args, **kwargs)
+                try:
+                    result = func(*args, **kwargs)
+                    span.set_data("mcp.resource.status", "success")
+                    return result
+                except Exception as e:
+                    span.set_data("mcp.resource.status", "error")
+                    sentry_sdk.capture_exception(e)
+                    raise
 
         if _is_coroutine_function(func):
             return async_wrapper  # type: ignore
@@ -207,82 +183,70 @@ def trace_splunk_operation(operation: str):
     def decorator(func: F) -> F:
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            if not _sentry_initialized:
+            if not is_initialized():
                 return await func(*args, **kwargs)
 
-            try:
-                import sentry_sdk
-
-                with sentry_sdk.start_span(
-                    op="splunk.api",
-                    name=f"splunk/{operation}",
-                    description=f"Splunk operation: {operation}",
-                ) as span:
-                    span.set_data("splunk.operation", operation)
-
-                    query = kwargs.get("query")
-                    if not query and args:
-                        first_arg = args[0] if len(args) > 0 else None
-                        if isinstance(first_arg, str) and (
-                            "search" in first_arg.lower()
-                            or first_arg.startswith("|")
-                            or "index=" in first_arg.lower()
-                        ):
-                            query = first_arg
-
-                    if query and isinstance(query, str):
-                        span.set_data(
-                            "splunk.query_preview", query[:200] if len(query) > 200 else query
-                        )
-                        span.set_data("splunk.query_length", len(query))
-
-                    try:
-                        result = await func(*args, **kwargs)
-                        span.set_data("splunk.status", "success")
+            with sentry_sdk.start_span(
+                op="splunk.api",
+                name=f"splunk/{operation}",
+                description=f"Splunk operation: {operation}",
+            ) as span:
+                span.set_data("splunk.operation", operation)
+
+                query = kwargs.get("query")
+                if not query and args:
+                    first_arg = args[0] if len(args) > 0 else None
+                    if isinstance(first_arg, str) and (
+                        "search" in first_arg.lower()
+                        or first_arg.startswith("|")
+                        or "index=" in first_arg.lower()
+                    ):
+                        query = first_arg
+
+                if query and isinstance(query, str):
+                    span.set_data(
+                        "splunk.query_preview", query[:200] if len(query) > 200 else query
+                    )
+                    span.set_data("splunk.query_length", len(query))
 
-                        if isinstance(result, dict):
-                            if "results" in result and isinstance(result["results"], list):
-                                span.set_data("splunk.result_count", len(result["results"]))
-                            elif "count" in result:
-                                span.set_data("splunk.result_count", result["count"])
+                try:
+                    result = await func(*args, **kwargs)
+                    span.set_data("splunk.status", "success")
 
-                        return result
+                    if isinstance(result, dict):
+                        if "results" in result and isinstance(result["results"], list):
+                            span.set_data("splunk.result_count", len(result["results"]))
+                        elif "count" in result:
+                            span.set_data("splunk.result_count", result["count"])
 
-                    except Exception as e:
-                        span.set_data("splunk.status", "error")
-                        span.set_data("splunk.error_type", type(e).__name__)
-                        span.set_status("internal_error")
-                        sentry_sdk.capture_exception(e)
-                        raise
+                    return result
 
-            except ImportError:
-                return await func(*args, **kwargs)
+                except Exception as e:
+                    span.set_data("splunk.status", "error")
+                    span.set_data("splunk.error_type", type(e).__name__)
+                    span.set_status("internal_error")
+                    sentry_sdk.capture_exception(e)
+                    raise
 
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            if not _sentry_initialized:
+            if not is_initialized():
                 return func(*args, **kwargs)
 
-            try:
-                import sentry_sdk
+            with sentry_sdk.start_span(
+                op="splunk.api",
+                name=f"splunk/{operation}",
+            ) as span:
+                span.set_data("splunk.operation", operation)
 
-                with sentry_sdk.start_span(
-                    op="splunk.api",
-                    name=f"splunk/{operation}",
-                ) as span:
-                    span.set_data("splunk.operation", operation)
-
-                    try:
-                        result = func(*args, **kwargs)
-                        span.set_data("splunk.status", "success")
-                        return result
-                    except Exception as e:
-                        span.set_data("splunk.status", "error")
-                        sentry_sdk.capture_exception(e)
-                        raise
-
-            except ImportError:
-                return func(*args, **kwargs)
+                try:
+                    result = func(*args, **kwargs)
+                    span.set_data("splunk.status", "success")
+                    return result
+                except Exception as e:
+                    span.set_data("splunk.status", "error")
+                    sentry_sdk.capture_exception(e)
+                    raise
 
         if _is_coroutine_function(func):
             return async_wrapper  # type: ignore
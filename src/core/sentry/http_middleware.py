@@ -9,7 +9,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
-from .config import _sentry_initialized, mcp_request_id, mcp_session_id
+from .config import is_initialized, mcp_request_id, mcp_session_id, sentry_sdk
 from .context import add_breadcrumb
 
 logger = logging.getLogger(__name__)
@@ -20,12 +20,7 @@ class SentryHTTPMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next) -> Response:
         """Process HTTP request with Sentry tracing."""
-        if not _sentry_initialized:
-            return cast(Response, await call_next(request))
-
-        try:
-            import sentry_sdk
-        except ImportError:
+        if not is_initialized():
             return cast(Response, await call_next(request))
 
         # Extract session ID from headers
@@ -77,7 +72,7 @@ class SentryHTTPMiddleware(BaseHTTPMiddleware):
                 transaction.set_data("http.url", str(request.url))
                 transaction.set_data("http.path", path)
 
-                if request.client:
+                if request.client and sentry_sdk.get_client().should_send_default_pii():
                     transaction.set_data("client.ip", request.client.host)
 
                 add_breadcrumb(
@@ -2,16 +2,24 @@
 
 import json
 import logging
+import re
 import time
 from typing import Any
 
 from fastmcp.server.middleware import Middleware, MiddlewareContext
 
-from .config import _sentry_initialized
+from .config import is_initialized, sentry_sdk
 from .context import add_breadcrumb, set_mcp_context
 
 logger = logging.getLogger(__name__)
 
+# Inline credentials in free-form text, e.g. ``password=...``, ``"token": "..."``, ``Bearer ...``
+_SENSITIVE_TEXT_RE = re.compile(
+    r"(?i)(\"?(?:password|passwd|token|secret|authorization|api_?key|dsn)\"?\s*[:=]\s*)"
+    r"(\"[^\"]*\"|[^\s,;&\"}]+)"
+)
+_BEARER_RE = re.compile(r"(?i)\b(bearer|basic|splunk)\s+[A-Za-z0-9._~+/=-]{8,}")
+
 
 class SentryMCPMiddleware(Middleware):
     """MCP middleware for Sentry method-level tracing."""
@@ -22,12 +30,7 @@ class SentryMCPMiddleware(Middleware):
 
     async def on_request(self, context: MiddlewareContext, call_next):
         """Process MCP request with Sentry tracing."""
-        if not _sentry_initialized:
-            return await call_next(context)
-
-        try:
-            import sentry_sdk
-        except ImportError:
+        if not is_initialized():
             return await call_next(context)
 
         method = getattr(context, "method", "unknown")
@@ -40,50 +43,46 @@ class SentryMCPMiddleware(Middleware):
 
         start_time = time.perf_counter()
 
-        try:
-            with sentry_sdk.start_span(
-                op=span_op,
-                name=span_name,
-                description=f"MCP method: {method}",
-            ) as span:
-                span.set_data("mcp.method.name", method)
-                if session_id:
-                    span.set_data("mcp.session.id", session_id)
-
-                self._set_method_specific_data(span, context)
-
-                add_breadcrumb(
-                    message=f"MCP {method}",
-                    category=f"mcp.{method.split('/')[0] if '/' in method else 'method'}",
-                    level="info",
-                    data={"method": method, "session_id": session_id},
-                )
-
-                try:
-                    result = await call_next(context)
+        with sentry_sdk.start_span(
+            op=span_op,
+            name=span_name,
+            description=f"MCP method: {method}",
+        ) as span:
+            span.set_data("mcp.method.name", method)
+            if session_id:
+                span.set_data("mcp.session.id", session_id)
+
+            self._set_method_specific_data(span, context)
+
+            add_breadcrumb(
+                message=f"MCP {method}",
+                category=f"mcp.{method.split('/')[0] if '/' in method else 'method'}",
+                level="info",
+                data={"method": method, "session_id": session_id},
+            )
 
-                    duration_ms = (time.perf_counter() - start_time) * 1000
-                    span.set_data("mcp.duration_ms", round(duration_ms, 2))
-                    span.set_data("mcp.status", "success")
-                    span.set_status("ok")
+            try:
+                result = await call_next(context)
 
-                    self._set_result_metadata(span, result)
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                span.set_data("mcp.duration_ms", round(duration_ms, 2))
+                span.set_data("mcp.status", "success")
+                span.set_status("ok")
 
-                    return result
+                self._set_result_metadata(span, result)
 
-                except Exception as e:
-                    duration_ms = (time.perf_counter() - start_time) * 1000
-                    span.set_data("mcp.duration_ms", round(duration_ms, 2))
-                    span.set_data("mcp.status", "error")
-                    span.set_data("mcp.error.type", type(e).__name__)
-                    span.set_data("mcp.error.message", str(e)[:500])
-                    span.set_status("internal_error")
+                return result
 
-                    sentry_sdk.capture_exception(e)
-                    raise
+            except Exception as e:
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                span.set_data("mcp.duration_ms", round(duration_ms, 2))
+                span.set_data("mcp.status", "error")
+                span.set_data("mcp.error.type", type(e).__name__)
+                span.set_data("mcp.error.message", str(e)[:500])
+                span.set_status("internal_error")
 
-        except ImportError:
-            return await call_next(context)
+                sentry_sdk.capture_exception(e)
+                raise
 
     def _get_span_op(self, method: str) -> str:
         """Get the span operation type for an MCP method."""
@@ -166,8 +165,8 @@ class SentryMCPMiddleware(Middleware):
                         except Exception:
                             span.set_data("request.body", str(sanitized)[:2000])
                     else:
-                        span.set_data("mcp.tool.arguments", str(args)[:500])
-                        span.set_data("request.body", str(args)[:2000])
+                        span.set_data("mcp.tool.arguments", self._sanitize_text(str(args)))
+                        span.set_data("request.body", self._sanitize_text(str(args)))
                 else:
                     span.set_data("mcp.tool.arguments", "{}")
                     span.set_data("request.body", "{}")
@@ -227,10 +226,12 @@ class SentryMCPMiddleware(Middleware):
                             if isinstance(first_item, dict) and "text" in first_item:
                                 text = first_item["text"]
                                 if isinstance(text, str):
-                                    span.set_data("response.content_preview", text[:1000])
+                                    span.set_data(
+                                        "response.content_preview", self._sanitize_text(text)
+                                    )
                     elif isinstance(content, str):
                         span.set_data("mcp.result.content_length", len(content))
-                        span.set_data("response.content_preview", content[:1000])
+                        span.set_data("response.content_preview", self._sanitize_text(content))
 
                 try:
                     sanitized_result = self._sanitize_result(result)
@@ -238,18 +239,19 @@ class SentryMCPMiddleware(Middleware):
                     span.set_data("response.body", response_json[:4000])
                     span.set_data("response.body_size", len(response_json))
                 except Exception:
-                    span.set_data("response.body", str(result)[:2000])
+                    span.set_data("response.body", self._sanitize_text(str(result)))
 
             elif isinstance(result, list):
                 span.set_data("mcp.result.length", len(result))
                 try:
-                    span.set_data("response.body", json.dumps(result, default=str)[:2000])
+                    response_json = json.dumps(result, default=str)
+                    span.set_data("response.body", self._sanitize_text(response_json))
                 except Exception:
                     span.set_data("response.body", f"[list with {len(result)} items]")
 
             elif isinstance(result, str):
                 span.set_data("mcp.result.length", len(result))
-                span.set_data("response.body", result[:2000])
+                span.set_data("response.body", self._sanitize_text(result))
 
             else:
                 try:
@@ -261,9 +263,9 @@ class SentryMCPMiddleware(Middleware):
                         response_json = json.dumps(sanitized, default=str)[:4000]
                         span.set_data("response.body", response_json)
                     else:
-                        span.set_data("response.body", str(result)[:2000])
+                        span.set_data("response.body", self._sanitize_text(str(result)))
                 except Exception:
-                    span.set_data("response.body", str(result)[:2000])
+                    span.set_data("response.body", self._sanitize_text(str(result)))
 
         except Exception as e:
             span.set_data("response.error", str(e)[:200])
@@ -289,6 +291,14 @@ class SentryMCPMiddleware(Middleware):
 
         return sanitized
 
+    def _sanitize_text(self, text: str, limit: int = 500) -> str:
+        """Redact inline credentials from free-form text and truncate it to ``limit`` chars."""
+        redacted = _BEARER_RE.sub(r"\1 ***REDACTED***", text[: limit * 2])
+        redacted = _SENSITIVE_TEXT_RE.sub(r"\1***REDACTED***", redacted)
+        if len(text) <= limit:
+            return redacted
+        return f"{redacted[:limit]}... [{len(text)} chars total]"
+
     def _sanitize_result(self, result: Any, max_depth: int = 3) -> Any:
         """Sanitize result data for Sentry, truncating large values."""
         if not isinstance(result, dict) or max_depth <= 0:
@@ -343,7 +353,7 @@ class SentryMCPMiddleware(Middleware):
 
 def create_sentry_middlewares():
     """Factory function to create Sentry middleware instances."""
-    if not _sentry_initialized:
+    if not is_initialized():
         logger.debug("Sentry not initialized, skipping middleware creation")
         return None, None
 
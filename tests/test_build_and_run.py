@@ -0,0 +1,278 @@
+"""Tests for the local stop-path helpers in src/cli/build_and_run.py."""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+import pytest
+
+from src.cli import build_and_run
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX process helpers")
+
+
+def _marker() -> str:
+    return f"mcp-stop-test-{uuid.uuid4().hex[:12]}"
+
+
+def _spawn_named(name: str, **kwargs) -> subprocess.Popen:
+    """Start ``sleep 300`` whose argv[0] is ``name`` and wait until the exec happened."""
+    proc = subprocess.Popen(["bash", "-c", f"exec -a {name} sleep 300"], **kwargs)
+    deadline = time.monotonic() + 5
+    while name.encode() not in build_and_run._cmdline(proc.pid):
+        assert time.monotonic() < deadline, "child never exec'd"
+        time.sleep(0.01)
+    return proc
+
+
+def _gone(pid: int) -> bool:
+    """True once ``pid`` has exited; zombies awaiting reaping count as exited."""
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] == "Z"
+    except FileNotFoundError:
+        return True
+    except OSError:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        return False
+
+
+def _wait_gone(pid: int, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not _gone(pid):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.mark.skipif(not hasattr(os, "killpg"), reason="needs process groups")
+class TestSignalGroup:
+    def test_matching_session_leader_takes_its_group_down(self):
+        name = _marker()
+        # The leader backgrounds a grandchild in its own group, reports its PID, then execs
+        leader = subprocess.Popen(
+            ["bash", "-c", f"sleep 300 & echo $!; exec -a {name} sleep 300"],
+            stdout=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+        grandchild = int(leader.stdout.readline())
+        try:
+            deadline = time.monotonic() + 5
+            while name.encode() not in build_and_run._cmdline(leader.pid):
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+            assert os.getpgid(grandchild) == leader.pid
+
+            build_and_run._signal_group(leader.pid, signal.SIGTERM, [name])
+
+            assert leader.wait(timeout=5) == -signal.SIGTERM
+            assert _wait_gone(grandchild)
+        finally:
+            for pid in (leader.pid, grandchild):
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            leader.wait()
+            leader.stdout.close()
+
+    def test_non_matching_pid_gets_a_single_kill(self, monkeypatch):
+        proc = _spawn_named(_marker(), start_new_session=True)
+        calls = []
+        real_kill = os.kill
+        monkeypatch.setattr(os, "killpg", lambda *args: calls.append(("killpg", *args)))
+
+        def _kill(pid, sig):
+            calls.append(("kill", pid, sig))
+            real_kill(pid, sig)
+
+        monkeypatch.setattr(os, "kill", _kill)
+        try:
+            # A reused PID: it still leads a group, but no longer runs the server
+            assert os.getpgid(proc.pid) == proc.pid
+            build_and_run._signal_group(proc.pid, signal.SIGTERM, ["not-the-server"])
+        finally:
+            monkeypatch.undo()
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+
+        assert calls == [("kill", proc.pid, signal.SIGTERM)]
+
+
+@pytest.mark.parametrize(
+    ("output", "expected"),
+    [
+        (b"", []),
+        (b"4242\n", [4242]),
+        (b"101\n202\n303\n", [101, 202, 303]),
+        (b"  7\r\n8  \n", [7, 8]),
+        (b"pgrep: invalid option\n", []),
+    ],
+)
+def test_parse_pids(output, expected):
+    assert build_and_run._parse_pids(output) == expected
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="needs /proc")
+class TestScanProc:
+    def test_finds_spawned_process_by_unique_argv(self):
+        name = _marker()
+        proc = _spawn_named(name)
+        try:
+            assert build_and_run._scan_proc([name]) == {proc.pid}
+        finally:
+            proc.kill()
+            proc.wait()
+
+    def test_excludes_own_pid(self):
+        with open("/proc/self/cmdline", "rb") as f:
+            own_cmdline = f.read().replace(b"\0", b" ").strip().decode()
+
+        assert os.getpid() not in build_and_run._scan_proc([own_cmdline])
+
+
+class TestFindPids:
+    def test_falls_back_to_pgrep_when_proc_is_unreadable(self, monkeypatch):
+        def _denied(patterns):
+            raise PermissionError(13, "Permission denied", "/proc")
+
+        monkeypatch.setattr(sys, "platform", "linux")
+        monkeypatch.setattr(build_and_run, "_scan_proc", _denied)
+        monkeypatch.setattr(build_and_run, "_pgrep_pids", lambda patterns: {4242})
+
+        assert build_and_run._find_pids(["server"]) == {4242}
+
+    def test_uses_pgrep_off_linux(self, monkeypatch):
+        monkeypatch.setattr(sys, "platform", "darwin")
+        monkeypatch.setattr(build_and_run, "_scan_proc", pytest.fail)
+        monkeypatch.setattr(build_and_run, "_pgrep_pids", lambda patterns: {7})
+
+        assert build_and_run._find_pids(["server"]) == {7}
+
+
+@pytest.fixture(params=["pidfd", "polling"])
+def wait_mode(request, monkeypatch):
+    if request.param == "pidfd":
+        if not hasattr(os, "pidfd_open"):
+            pytest.skip("os.pidfd_open not available")
+    else:
+        monkeypatch.delattr(os, "pidfd_open", raising=False)
+    return request.param
+
+
+class TestWaitExit:
+    def test_returns_true_soon_after_exit(self, wait_mode):
+        proc = subprocess.Popen(["sleep", "0.2"])
+        # Reap from a thread, as the real parent would; polling treats zombies as alive
+        reaper = threading.Thread(target=proc.wait)
+        reaper.start()
+        try:
+            start = time.monotonic()
+            assert build_and_run._wait_exit(proc.pid, timeout=5.0) is True
+            assert time.monotonic() - start < 2.0
+        finally:
+            reaper.join()
+
+    def test_returns_true_for_missing_pid(self, wait_mode):
+        proc = subprocess.Popen(["true"])
+        proc.wait()
+
+        assert build_and_run._wait_exit(proc.pid, timeout=1.0) is True
+
+    def test_returns_false_after_timeout_for_live_process(self, wait_mode):
+        proc = subprocess.Popen(["sleep", "300"])
+        try:
+            start = time.monotonic()
+            assert build_and_run._wait_exit(proc.pid, timeout=0.2) is False
+            assert time.monotonic() - start >= 0.2
+        finally:
+            proc.kill()
+            proc.wait()
+
+
+class TestComposeProbeCache:
+    @pytest.fixture(autouse=True)
+    def home(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+        return tmp_path
+
+    @pytest.fixture
+    def docker(self, monkeypatch):
+        """Pretend docker is installed and count `docker compose version` probes."""
+        probes = []
+
+        def _run(cmd, **kwargs):
+            probes.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0)
+
+        monkeypatch.setattr(build_and_run.shutil, "which", lambda name: f"/usr/bin/{name}")
+        monkeypatch.setattr(build_and_run.subprocess, "run", _run)
+        return probes
+
+    def test_cache_lives_under_home_cache(self, home):
+        expected = home / ".cache" / "mcp-for-splunk" / "docker-compose-probe"
+        assert build_and_run._compose_probe_cache() == expected
+
+    def test_cache_honours_xdg_cache_home(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+        expected = tmp_path / "xdg" / "mcp-for-splunk" / "docker-compose-probe"
+        assert build_and_run._compose_probe_cache() == expected
+
+    def test_relative_xdg_cache_home_is_ignored(self, home, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", "relative/cache")
+        assert build_and_run._compose_probe_cache().parent.parent == home / ".cache"
+
+    def test_hit_requires_same_docker_path(self):
+        build_and_run._store_compose_probe("/usr/bin/docker")
+
+        assert build_and_run._compose_probe_cached("/usr/bin/docker")
+        assert not build_and_run._compose_probe_cached("/usr/local/bin/docker")
+
+    def test_entry_expires_after_ttl(self):
+        build_and_run._store_compose_probe("/usr/bin/docker")
+        stale = time.time() - build_and_run.COMPOSE_PROBE_CACHE_TTL - 1
+        os.utime(build_and_run._compose_probe_cache(), (stale, stale))
+
+        assert not build_and_run._compose_probe_cached("/usr/bin/docker")
+
+    def test_missing_cache_is_a_miss(self):
+        assert not build_and_run._compose_probe_cached("/usr/bin/docker")
+
+    def test_check_compose_available_probes_once(self, docker):
+        assert build_and_run.check_compose_available() == (True, ["docker", "compose"])
+        assert build_and_run.check_compose_available() == (True, ["docker", "compose"])
+
+        assert docker == [["docker", "compose", "version"]]
+
+    def test_failed_compose_call_forgets_the_probe(self, docker, monkeypatch):
+        build_and_run.check_compose_available()
+        monkeypatch.setattr(
+            build_and_run.subprocess,
+            "run",
+            lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 1),
+        )
+
+        assert build_and_run.run_cmd(["docker", "compose", "up", "-d"]) == 1
+        assert not build_and_run._compose_probe_cache().exists()
+
+    def test_other_failed_commands_keep_the_probe(self, docker, monkeypatch):
+        build_and_run.check_compose_available()
+        monkeypatch.setattr(
+            build_and_run.subprocess,
+            "run",
+            lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 1),
+        )
+
+        assert build_and_run.run_cmd(["uv", "sync", "--dev"]) == 1
+        assert build_and_run._compose_probe_cache().exists()
@@ -0,0 +1,91 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+_SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "security_summary.py"
+_spec = importlib.util.spec_from_file_location("security_summary", _SCRIPT)
+security_summary = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(security_summary)
+
+
+@pytest.mark.parametrize(
+    ("score", "expected"),
+    [
+        (9.8, "critical"),
+        ("7.5", "high"),
+        ("4.0", "medium"),
+        (1, "low"),
+        (None, "medium"),
+        ("n/a", "medium"),
+    ],
+)
+def test_classify_cvss(score, expected):
+    assert security_summary._classify_cvss(score) == expected
+
+
+_VULNS = [
+    {
+        "package_name": "jinja2",
+        "vulnerability_id": "70612",
+        "advisory": "Sandbox escape",
+        "cve": "CVE-2024-22195",
+        "severity": {"cvss_score": "9.1"},
+    },
+    {"package_name": "urllib3", "vulnerability_id": "71608", "severity": None},
+]
+
+
+@pytest.mark.parametrize("payload", [{"vulnerabilities": _VULNS}, _VULNS])
+def test_parse_safety_json_dict_and_list(tmp_path, payload):
+    path = tmp_path / "safety.json"
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+    findings = security_summary.parse_safety_json(str(path))
+
+    assert [(f.title, f.severity, f.cve) for f in findings] == [
+        ("jinja2 vulnerability", "critical", "CVE-2024-22195"),
+        ("urllib3 vulnerability", "medium", "71608"),
+    ]
+    assert findings[0].description == "Sandbox escape"
+
+
+def test_parse_safety_json_missing_or_malformed(tmp_path):
+    bad = tmp_path / "safety.json"
+    bad.write_text("not json", encoding="utf-8")
+
+    assert security_summary.parse_safety_json(str(bad)) == []
+    assert security_summary.parse_safety_json(str(tmp_path / "missing.json")) == []
+
+
+def _finding(severity, category="code"):
+    return security_summary.Finding(
+        tool="bandit", severity=severity, category=category, title="t", description=""
+    )
+
+
+def test_scan_result_findings_are_read_only():
+    result = security_summary.ScanResult()
+    result.add_findings([_finding("high"), _finding("critical", "secret")])
+
+    assert isinstance(result.findings, tuple)
+    with pytest.raises(AttributeError):
+        result.findings.append(_finding("low"))
+    assert (result.total_count, result.high_count, result.critical_count) == (2, 1, 1)
+    assert result.secret_count == 1
+    assert result.of_severity("medium") == ()
+
+
+def test_clean_and_findings_reports_share_the_summary_table():
+    clean = security_summary.ScanResult(scan_time="T", tool_status={"bandit": "Clean"})
+    dirty = security_summary.ScanResult(scan_time="T", tool_status={"bandit": "Parsed"})
+    dirty.add_findings([_finding("low")])
+
+    clean_md = security_summary.generate_markdown_report(clean)
+    dirty_md = security_summary.generate_markdown_report(dirty)
+
+    assert clean_md.endswith("- bandit: Clean\n\n**All clear!** No security findings detected.\n")
+    assert "| Low | 0 |\n" in clean_md
+    assert "| Low | 1 |\n| Secrets | No |\n| **Total** | **1** |\n" in dirty_md
+    assert clean_md.split("## Summary")[0] == dirty_md.split("## Summary")[0]
@@ -0,0 +1,11 @@
+from src.core.sentry import config, context, decorators, http_middleware, mcp_middleware
+
+
+def test_helpers_see_init_state_set_after_import(monkeypatch):
+    # init_sentry() runs after these modules are imported; the gate must not be a stale copy
+    monkeypatch.setattr(config, "_sentry_initialized", False)
+    assert not context.is_initialized()
+
+    monkeypatch.setattr(config, "_sentry_initialized", True)
+    for module in (context, decorators, http_middleware, mcp_middleware):
+        assert module.is_initialized()